@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Apply (or check) the Reports.js source patches.
+
+Thin wrapper around scripts/patch_reports.mjs, which finds its targets on the
+Babel AST and only rewrites spans that differ. The node ranges it reports are
+cached in .cache/patch_reports.pickle keyed by the mtime and size of the target
+files, the codemod and its replacement snippets, so a repeated --check, or an
+apply when everything is already patched, skips reparsing entirely. Inspected
+spans come back with their text, so --check never re-reads the JS files itself.
+An apply reports ranges in the patched files' coordinates, so it refreshes the
+cache without a second codemod run.
+
+Usage:
+    python patch_reports.py            # apply patches
+    python patch_reports.py --check    # show status + parseUnifiedGeminiResponse excerpt
+"""
+
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CODEMOD = os.path.join(ROOT, 'scripts', 'patch_reports.mjs')
+CACHE_PATH = os.path.join(ROOT, '.cache', 'patch_reports.pickle')
+# Bump when the codemod's report format changes so stale caches are ignored
+REPORT_FORMAT = 3
+FAILED_STATUSES = ('not-found', 'diverged')
+TARGET_FILES = ('src/pages/Reports.js',)
+# Inputs that decide what the patched code should be
+PATCH_INPUTS = ('scripts/patch_reports.mjs', 'fix_parser.txt')
+
+
+def file_fingerprint():
+    """(path, mtime_ns, size) for every file the codemod touches or reads patches from."""
+    fingerprint = []
+    for relative in TARGET_FILES + PATCH_INPUTS:
+        stat = os.stat(os.path.join(ROOT, relative))
+        fingerprint.append((relative, stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
+def load_cached_report():
+    try:
+        with open(CACHE_PATH, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError):
+        return None
+    if cached.get('format') != REPORT_FORMAT or cached.get('fingerprint') != file_fingerprint():
+        return None
+    return cached['report']
+
+
+def store_report(report):
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    with open(CACHE_PATH, 'wb') as f:
+        pickle.dump({'format': REPORT_FORMAT, 'fingerprint': file_fingerprint(), 'report': report}, f)
+
+
+def run_codemod(*args):
+    result = subprocess.run(
+        ['node', CODEMOD, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+    )
+    if result.returncode != 0 and not result.stdout:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(result.returncode)
+    return result
+
+
+def get_report():
+    report = load_cached_report()
+    if report is None:
+        report = json.loads(run_codemod('--ranges').stdout)
+        store_report(report)
+    return report
+
+
+def print_status(report):
+    for entry in report:
+        icon = '❌' if entry['status'] in FAILED_STATUSES else '✅'
+        print(f"{icon} {entry['id']} ({entry['file']}): {entry['status']}")
+
+
+def check():
+    report = get_report()
+    print_status(report)
+
+    for entry in report:
+        if not entry.get('inspect') or not entry.get('text'):
+            continue
+        func = entry['text']
+        print(f"\nFunction length: {len(func)} chars")
+        print("\n=== FUNCTION START ===")
+        print(func[:2000])
+        print("\n... [middle content] ...\n")
+        print(func[-1000:])
+        print("=== FUNCTION END ===")
+
+    return 1 if any(entry['status'] in FAILED_STATUSES for entry in report) else 0
+
+
+def apply():
+    report = load_cached_report()
+    patches = [entry for entry in (report or []) if not entry.get('inspect')]
+    if patches and all(entry['status'] in ('up-to-date', 'patched') for entry in patches):
+        print('✅ All patches already applied')
+        return 0
+
+    result = run_codemod('--json')
+    report = json.loads(result.stdout)
+    print_status(report)
+    store_report(report)
+    return result.returncode
+
+
+if __name__ == '__main__':
+    sys.exit(check() if '--check' in sys.argv[1:] else apply())
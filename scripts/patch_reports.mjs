@@ -0,0 +1,215 @@
+#!/usr/bin/env node
+/**
+ * Source patches for Reports.js
+ *
+ * Replaces the old one-off Python patchers (add_pawnsposes_ai.py, check_parser.py,
+ * fix_parser.py). Targets are located on the Babel AST instead of with regexes.
+ * A patch only rewrites a span that still holds the code it was written against
+ * (`original`); a span that already has the wanted code is up to date, and one that
+ * has changed in any other way is reported as diverged and left alone, so the
+ * codemod never overwrites newer code with a stale snippet.
+ *
+ * Patched spans are spliced by node range rather than re-printed, so the rest of
+ * each file keeps its formatting. Target files are processed concurrently, and each
+ * one is read once and written at most once no matter how many patches it gets.
+ *
+ * Usage:
+ *   node scripts/patch_reports.mjs            # apply all patches
+ *   node scripts/patch_reports.mjs --check    # only report what would change
+ *   node scripts/patch_reports.mjs --ranges   # print target node ranges as JSON
+ *   node scripts/patch_reports.mjs --json     # apply, printing the report as JSON
+ *
+ * Ranges are UTF-16 offsets into the file contents as they are after the run, so an
+ * apply report can be reused like a --ranges one. Inspections also include the
+ * text of their span. Usually driven through patch_reports.py, which caches the
+ * report between runs.
+ */
+
+import fs from 'fs/promises';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { parse } from '@babel/parser';
+
+const ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..');
+const REPORTS_JS = path.join(ROOT, 'src/pages/Reports.js');
+
+const PAWNSPOSES_IMPORT = "import { performPawnsposesAIAnalysis, preconnectPawnsposesAI } from '../services/pawnsposesAIService';";
+const PAWNSPOSES_IMPORT_V1 = "import { performPawnsposesAIAnalysis } from '../services/pawnsposesAIService';";
+const PAWNSPOSES_SERVICE_SOURCE = '../services/pawnsposesAIService';
+
+function parseSource(source) {
+  return parse(source, {
+    sourceType: 'module',
+    allowReturnOutsideFunction: true,
+    errorRecovery: true,
+    plugins: ['jsx']
+  });
+}
+
+// Include comments that sit directly above a declaration (no blank line in between)
+function startWithLeadingComments(node) {
+  let start = node.start;
+  let line = node.loc.start.line;
+  const comments = node.leadingComments || [];
+  for (let i = comments.length - 1; i >= 0; i--) {
+    if (comments[i].loc.end.line < line - 1) break;
+    start = comments[i].start;
+    line = comments[i].loc.start.line;
+  }
+  return start;
+}
+
+// Top-level `const name = ...` declaration, including its leading comment. Only the
+// program body is scanned; nested declarations can never match, so a full traversal
+// of the (large) file is unnecessary.
+function findConstDeclaration(ast, name) {
+  const declaration = ast.program.body.find(node =>
+    node.type === 'VariableDeclaration' &&
+    node.declarations.some(declarator => declarator.id.type === 'Identifier' && declarator.id.name === name)
+  );
+  return declaration
+    ? { start: startWithLeadingComments(declaration), end: declaration.end }
+    : null;
+}
+
+function findPawnsposesImport(ast) {
+  const declaration = ast.program.body.find(node =>
+    node.type === 'ImportDeclaration' && node.source.value === PAWNSPOSES_SERVICE_SOURCE
+  );
+  if (declaration) return { start: declaration.start, end: declaration.end };
+
+  // Insert after the last import
+  const imports = ast.program.body.filter(node => node.type === 'ImportDeclaration');
+  const last = imports[imports.length - 1];
+  return { start: last.end, end: last.end, insert: true };
+}
+
+/**
+ * Spans reported by --check / --ranges without being modified
+ */
+const INSPECTIONS = [
+  {
+    id: 'parse-unified-gemini-response',
+    file: REPORTS_JS,
+    locate: (ast) => findConstDeclaration(ast, 'parseUnifiedGeminiResponse')
+  }
+];
+
+const readReplacement = async (file) => (await fs.readFile(path.join(ROOT, file), 'utf8')).replace(/\r\n/g, '\n');
+
+/**
+ * Each patch: file to edit, how to find the target span, the text it should contain,
+ * and the text it may replace (without `original`, a patch can only be verified)
+ */
+const PATCHES = [
+  {
+    id: 'pawnsposes-ai-import',
+    file: REPORTS_JS,
+    locate: findPawnsposesImport,
+    replacement: () => PAWNSPOSES_IMPORT,
+    original: () => PAWNSPOSES_IMPORT_V1,
+    render: (text, range) => (range.insert ? `\n${text}` : text)
+  },
+  {
+    id: 'parse-weaknesses-from-unified',
+    file: REPORTS_JS,
+    locate: (ast) => findConstDeclaration(ast, 'parseWeaknessesFromUnified'),
+    replacement: () => readReplacement('fix_parser.txt').trim()
+  }
+];
+
+// Map a pre-splice range onto the spliced file by shifting it past earlier splices
+function shiftRange(range, splices) {
+  if (!range) return range;
+  const offset = splices
+    .filter(splice => splice.end <= range.start)
+    .reduce((sum, splice) => sum + splice.delta, 0);
+  return { ...range, start: range.start + offset, end: range.end + offset };
+}
+
+async function patchFile(file, mode) {
+  let source = await fs.readFile(file, 'utf8');
+  const ast = parseSource(source);
+  const relativeFile = path.relative(ROOT, file);
+  const report = [];
+
+  // Inspected spans carry their source text, so callers never have to re-read and
+  // slice the file
+  INSPECTIONS.filter(inspection => inspection.file === file).forEach(inspection => {
+    const range = inspection.locate(ast);
+    const text = range ? source.slice(range.start, range.end) : null;
+    report.push({ id: inspection.id, file: relativeFile, range, text, status: range ? 'found' : 'not-found', inspect: true });
+  });
+
+  // Locate everything on one parse, then splice from the end so earlier ranges stay valid
+  const patches = PATCHES.filter(patch => patch.file === file);
+  const replacements = await Promise.all(patches.map(patch => patch.replacement()));
+  const located = patches
+    .map((patch, i) => ({ patch, wanted: replacements[i], range: patch.locate(ast) }))
+    .sort((a, b) => (b.range?.start ?? -1) - (a.range?.start ?? -1));
+
+  const splices = [];
+  located.forEach(({ patch, wanted, range }) => {
+    const entry = { id: patch.id, file: relativeFile, range };
+    if (!range) {
+      report.push({ ...entry, status: 'not-found' });
+      return;
+    }
+
+    const current = source.slice(range.start, range.end);
+    if (!range.insert && current.trim() === wanted) {
+      report.push({ ...entry, status: 'up-to-date' });
+      return;
+    }
+
+    // Only replace the exact code the patch was written against
+    const original = range.insert ? null : patch.original?.();
+    if (!range.insert && current.trim() !== original) {
+      report.push({ ...entry, status: 'diverged' });
+      return;
+    }
+
+    if (mode === 'apply') {
+      const text = patch.render ? patch.render(wanted, range) : wanted;
+      source = source.slice(0, range.start) + text + source.slice(range.end);
+      const splice = { start: range.start, end: range.end, delta: text.length - (range.end - range.start) };
+      splices.push(splice);
+      report.push({ ...entry, range: { start: range.start, end: range.start + text.length }, status: 'patched', splice });
+      return;
+    }
+    report.push({ ...entry, status: 'needs-patch' });
+  });
+
+  if (splices.length) {
+    await fs.writeFile(file, source, 'utf8');
+    report.forEach(entry => {
+      entry.range = shiftRange(entry.range, splices.filter(splice => splice !== entry.splice));
+      delete entry.splice;
+    });
+  }
+
+  return report;
+}
+
+async function run(mode) {
+  const files = [...new Set([...PATCHES, ...INSPECTIONS].map(target => target.file))];
+  const reports = await Promise.all(files.map(file => patchFile(file, mode)));
+  return reports.flat();
+}
+
+const args = process.argv.slice(2);
+const mode = args.includes('--check') ? 'check' : args.includes('--ranges') ? 'ranges' : 'apply';
+const report = await run(mode === 'apply' ? 'apply' : 'check');
+const FAILED_STATUSES = ['not-found', 'diverged'];
+
+if (mode === 'ranges' || args.includes('--json')) {
+  process.stdout.write(JSON.stringify(report));
+} else {
+  report.forEach(({ id, file, status, range }) => {
+    const where = range ? ` [${range.start}-${range.end}, ${range.end - range.start} chars]` : '';
+    console.log(`${FAILED_STATUSES.includes(status) ? '❌' : '✅'} ${id} (${file}${where}): ${status}`);
+  });
+}
+if (report.some(entry => FAILED_STATUSES.includes(entry.status))) {
+  process.exitCode = 1;
+}
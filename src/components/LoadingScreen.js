@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { motion } from 'framer-motion';
 
-const LoadingScreen = ({ progressPercent = 0, currentStep = 0, elapsedTime = 0 }) => {
+const LoadingScreen = ({ progressPercent = 0, currentStep = 0, elapsedTime = 0, preview = null }) => {
   const [animatedStep, setAnimatedStep] = useState(currentStep);
   const [displayElapsedTime, setDisplayElapsedTime] = useState(0);
   
@@ -330,6 +330,39 @@ const LoadingScreen = ({ progressPercent = 0, currentStep = 0, elapsedTime = 0 }
           letter-spacing: 1px;
         }
 
+        /* Early findings streamed from the AI report */
+        .preview-section {
+          margin-top: 20px;
+          padding-top: 16px;
+          border-top: 1px solid #E5E5EA;
+        }
+
+        .preview-label {
+          font-size: 12px;
+          color: #8a8a8a;
+          font-weight: 500;
+          text-transform: uppercase;
+          letter-spacing: 0.5px;
+          margin-bottom: 8px;
+        }
+
+        .preview-summary {
+          font-size: 14px;
+          line-height: 1.45;
+          color: #333;
+          margin: 0 0 10px;
+          display: -webkit-box;
+          -webkit-line-clamp: 4;
+          -webkit-box-orient: vertical;
+          overflow: hidden;
+        }
+
+        .analyzer-popup .preview-section li {
+          margin-bottom: 6px;
+          font-size: 14px;
+          color: #333;
+        }
+
         .timer-icon {
           color: #FF9500;
           display: inline-flex;
@@ -376,6 +409,26 @@ const LoadingScreen = ({ progressPercent = 0, currentStep = 0, elapsedTime = 0 }
           })}
         </ul>
 
+        {/* Report preview: filled in section by section while the AI report streams */}
+        {preview && (
+          <motion.div
+            className="preview-section"
+            initial={{ opacity: 0 }}
+            animate={{ opacity: 1 }}
+            transition={{ duration: 0.4 }}
+          >
+            <div className="preview-label">🔍 Early findings</div>
+            {preview.executiveSummary && <p className="preview-summary">{preview.executiveSummary}</p>}
+            {preview.weaknesses?.length > 0 && (
+              <ul>
+                {preview.weaknesses.filter(Boolean).map((title, index) => (
+                  <li key={index}>• {title}</li>
+                ))}
+              </ul>
+            )}
+          </motion.div>
+        )}
+
         {/* ETA Display */}
         <motion.div
           className="timer-section"
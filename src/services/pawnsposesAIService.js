@@ -0,0 +1,1065 @@
+/**
+ * Pawnsposes AI Analysis Service
+ * Builds the Pawnsposes coaching prompt from a user's games and sends it to Gemini.
+ * Each report is one streamed generateContent call; createMultiUserPrompt can also
+ * pack several users' games into a single prompt.
+ */
+
+import Ajv from 'ajv';
+import { getPuzzleDatabase } from '../utils/puzzleDatabase.js';
+import pawnsposesAnalysisSchema from '../schemas/pawnsposesAnalysis.schema.json';
+
+const GEMINI_API_BASE = 'https://generativelanguage.googleapis.com';
+const STANDARD_START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1';
+const PAWNSPOSES_MODEL = 'gemini-2.0-flash-exp';
+
+/**
+ * Convert a JSON Schema to Gemini's responseSchema (an OpenAPI subset): upper-case
+ * types and `nullable` instead of type unions. Every property is required and
+ * ordered, so the model always emits the full report in the documented order.
+ */
+const toGeminiSchema = (schema) => {
+  const types = [].concat(schema.type);
+  const converted = { type: types.find(type => type !== 'null').toUpperCase() };
+  if (types.includes('null')) converted.nullable = true;
+  if (schema.minItems !== undefined) converted.minItems = schema.minItems;
+  if (schema.items) converted.items = toGeminiSchema(schema.items);
+  if (schema.properties) {
+    const keys = Object.keys(schema.properties);
+    converted.properties = Object.fromEntries(keys.map(key => [key, toGeminiSchema(schema.properties[key])]));
+    converted.required = keys;
+    converted.propertyOrdering = keys;
+  }
+  return converted;
+};
+
+const PAWNSPOSES_RESPONSE_SCHEMA = toGeminiSchema(pawnsposesAnalysisSchema);
+
+// JSON mode: decoding is constrained to the schema, so responses are bare JSON
+// (no fences or prose) and shorter than free-form output
+const PAWNSPOSES_GENERATION_CONFIG = {
+  temperature: 0.7,
+  topK: 40,
+  topP: 0.95,
+  maxOutputTokens: 4096,
+  responseMimeType: 'application/json',
+  responseSchema: PAWNSPOSES_RESPONSE_SCHEMA,
+};
+
+// Bump when the prompt or response format changes so cached analyses are not reused
+const PAWNSPOSES_PROMPT_VERSION = 5;
+const ANALYSIS_CACHE_TTL_MS = 30 * 24 * 60 * 60 * 1000;
+
+// Retry policy for 429 / 503 responses
+const MAX_RATE_LIMIT_RETRIES = 5;
+const RETRY_BASE_DELAY_MS = 2000;
+const RETRY_MAX_DELAY_MS = 60000;
+
+// Context caching: the static instructions are stored once as a Gemini cachedContent
+// and referenced by name, so each call only uploads the games. Opt-in because the
+// model must support caching and the cached text must reach its minimum token count;
+// any failure to create the cache falls back to inline prompts.
+const CONTEXT_CACHE_ENABLED = process.env.REACT_APP_GEMINI_CONTEXT_CACHE === 'true';
+const CONTEXT_CACHE_TTL_SEC = 3600;
+const CONTEXT_CACHE_REFRESH_MARGIN_MS = 60000;
+// Statuses Gemini returns for a cachedContent that expired, was deleted or cannot be used
+const CONTEXT_CACHE_ERROR_STATUSES = [400, 403, 404];
+
+const getGeminiApiKey = () => {
+  const apiKey = process.env.REACT_APP_GEMINI_API_KEY;
+  if (!apiKey) {
+    throw new Error('Gemini API key not configured');
+  }
+  return apiKey;
+};
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Stable per-game identifier: chess.com games carry a url, lichess games only an id
+const gameIdentifier = (game) => game.url || game.id || '';
+
+/**
+ * Open the connection to the Gemini API ahead of the first call (DNS + TCP + TLS),
+ * so an analysis started from this page doesn't pay the handshake. Safe to call
+ * repeatedly; a no-op outside the browser.
+ */
+export const preconnectPawnsposesAI = () => {
+  if (typeof document === 'undefined') return;
+  if (document.head.querySelector(`link[rel="preconnect"][href="${GEMINI_API_BASE}"]`)) return;
+
+  const link = document.createElement('link');
+  link.rel = 'preconnect';
+  link.href = GEMINI_API_BASE;
+  // API calls are CORS requests, so the warmed connection must be an anonymous one
+  link.crossOrigin = 'anonymous';
+  document.head.appendChild(link);
+};
+
+/**
+ * fetch() that retries rate-limited (429) and overloaded (503) responses with
+ * exponential backoff and full jitter, honoring Retry-After when Gemini sends it
+ */
+const fetchWithBackoff = async (url, init) => {
+  for (let attempt = 0; ; attempt++) {
+    const response = await fetch(url, init);
+    if ((response.status !== 429 && response.status !== 503) || attempt >= MAX_RATE_LIMIT_RETRIES) {
+      return response;
+    }
+
+    const retryAfterSec = Number(response.headers?.get('retry-after'));
+    const backoffMs = Math.min(RETRY_MAX_DELAY_MS, RETRY_BASE_DELAY_MS * 2 ** attempt);
+    const delayMs = retryAfterSec > 0 ? retryAfterSec * 1000 : Math.random() * backoffMs;
+    console.warn(`⏳ Gemini returned ${response.status}, retrying in ${Math.round(delayMs)}ms (attempt ${attempt + 1}/${MAX_RATE_LIMIT_RETRIES})`);
+    await sleep(delayMs);
+  }
+};
+
+/**
+ * Run async task factories with at most `limit` in flight at once.
+ * Never rejects: returns Promise.allSettled-style results in task order.
+ * @param {Array<Function>} tasks - Functions returning a Promise
+ * @param {number} limit - Maximum concurrent tasks
+ * @returns {Promise<Array<Object>>} - [{ status: 'fulfilled', value } | { status: 'rejected', reason }]
+ */
+export const runWithConcurrency = async (tasks, limit) => {
+  const results = new Array(tasks.length);
+  const inFlight = new Set();
+
+  for (let index = 0; index < tasks.length; index++) {
+    if (inFlight.size >= limit) {
+      await Promise.race(inFlight);
+    }
+
+    const promise = Promise.resolve()
+      .then(() => tasks[index]())
+      .then(
+        value => { results[index] = { status: 'fulfilled', value }; },
+        reason => { results[index] = { status: 'rejected', reason }; }
+      )
+      .finally(() => inFlight.delete(promise));
+    inFlight.add(promise);
+  }
+
+  await Promise.all(inFlight);
+  return results;
+};
+
+// Static prompt sections shared by the single-user and multi-user prompts
+const PAWNSPOSES_PERSONA = `You are "Pawnsposes," a world-renowned chess Grandmaster (FIDE 2650+) and elite coach. Your analysis is famous for being insightful, practical, and deeply psychological. You don't just point out tactical mistakes; you uncover the flawed thinking and recurring habits that hold players back. Your tone is encouraging but direct.`;
+
+const PAWNSPOSES_ANALYSIS_FORMAT = `{
+  "executiveSummary": "A brief, encouraging but blunt paragraph summarizing the player's overall style and the key theme of this report.",
+  
+  "recurringWeaknesses": [
+    {
+      "title": "Sophisticated, high-level title that captures the psychological or strategic essence (e.g., 'Impulsive Pawn Pushes That Weaken King Safety', 'Critical Lapses in Tactical Vision Under Pressure', 'Premature Piece Commitments Before Completing Development', 'Neglecting Prophylactic Thinking in Critical Moments', 'Overextending in Pursuit of Illusory Attacks')",
+      "explanation": "Detailed explanation of why this is a weakness, explaining the long-term positional or strategic consequences.",
+      "examples": [
+        {
+          "gameNumber": 1,
+          "moveNumber": 15,
+          "move": "15...g5?",
+          "explanation": "EXACTLY 2 LINES REQUIRED. Line 1: Describe the tactical or strategic flaw with specific square and piece references. Line 2: Explain the immediate consequence or what the opponent gains from this move. Example: 'Rachitmehta unnecessarily trades queens, relieving White of pressure from open files and active pieces.\n This allows White to safely maneuver toward weak squares and consolidate.',
+          "betterPlan": "Suggest the superior plan and explain the future idea (e.g., 'Exchange the bishop to permanently weaken dark squares')"
+        }
+      ]
+    }
+  ],
+  
+  "middlegameMastery": {
+    "analysis": "Analyze the player's typical middlegame plans. Are they coherent? Do they correctly identify which side of the board to play on?",
+    "keyConceptToStudy": "One key middlegame concept they need to study (e.g., 'Outposts and Weak Squares', 'Pawn Breaks and Tension', 'Trading Good vs Bad Pieces', etc.)"
+  },
+  
+  "endgameTechnique": {
+    "assessment": "Assess the player's technique in the endgame phases. Are they confident in converting advantages? Do they defend well in difficult endgames?",
+    "skillToPractice": "One specific endgame skill to practice (e.g., 'Rook and Pawn Endgames', 'Calculating King Activity', 'The Principle of Two Weaknesses')"
+  },
+  
+  "improvementPlan": {
+    "threeStepChecklist": [
+      "Step 1: Concrete action for next 10 games",
+      "Step 2: Concrete action for next 10 games",
+      "Step 3: Concrete action for next 10 games"
+    ],
+    "youtubeVideo": {
+      "title": "ONLY if 100% confident: Exact video title as it appears on YouTube. Must address PRIMARY WEAKNESS. If uncertain video exists, use null.",
+      "creator": "ONLY if 100% confident: Verified channel (GothamChess, agadmator, ChessNetwork, Saint Louis Chess Club, Eric Rosen). If uncertain, use null. NEVER invent titles."
+    },
+    "masterGame": "Classic master game that illustrates a concept they need to learn (e.g., 'Kasparov vs Karpov, 1985 - Weak Square Exploitation')"
+  }
+}`;
+
+const PAWNSPOSES_REQUIREMENTS = `**CRITICAL STYLE REQUIREMENTS:**\n- Use sophisticated, high-level chess language throughout\n- Frame weaknesses as psychological/strategic patterns, not generic labels\n- Focus on thought process failures and decision-making patterns\n- Avoid simplistic titles like "Tactical Mistakes" or "Pawn Structure Issues"\n- Instead use descriptive, specific titles that capture the essence of the problem\n\n**IMPORTANT REQUIREMENTS:**
+1. Provide exactly 3 recurring weaknesses
+2. Each weakness must have 3 concrete examples from DIFFERENT games
+3. Examples must be STRATEGIC mistakes, not tactical blunders
+4. Focus on positional chess concepts that players above 1300-2600 struggle with
+5. Concepts to consider: outposts/weak squares, pawn breaks/pawn tension, trading good vs bad pieces, exchange sacrifices, counterattack, static and dynamic weaknesses, blockade or restriction, space advantage, minority attacks, isolated queen pawn, passed pawns, position evaluation, improving pieces, candidate moves, deep tactical visualization (3-4 moves)
+6. Return ONLY valid JSON, no additional text
+7. Cite each example only by "gameNumber" and the PGN "moveNumber"; write "move" as "15. g5" for a White move or "15... g5" for a Black move. Do NOT include FEN strings — positions are reconstructed from the move list
+**YOUTUBE VIDEO SUGGESTION GUIDELINES - CRITICAL ACCURACY REQUIREMENTS:**
+- The youtubeVideo MUST be a REAL, CURRENTLY AVAILABLE video on YouTube that is watchable in all regions
+- ONLY suggest videos from these TOP verified chess creators (millions of subscribers, proven extensive content libraries):
+  GothamChess (Levy Rozman), agadmator (Antonio Radic), ChessNetwork, Saint Louis Chess Club, Eric Rosen
+- DO NOT invent or hallucinate video titles - only suggest videos you are EXTREMELY CONFIDENT actually exist
+- Video title MUST be EXACT as it appears on YouTube - must be searchable by exact title
+- Video MUST be publicly available, NOT age-restricted, region-restricted, or private
+- VERIFIED EXAMPLES of REAL videos that definitely exist (use these as templates):
+  "Why You Lose Games" (GothamChess), "Chess Fundamentals" (agadmator), "Weak Squares Explained" (ChessNetwork),
+  "Opening Principles" (Eric Rosen), "Positional Play" (Saint Louis Chess Club)
+- If NOT 100% certain about exact title, suggest a general concept-based title like the examples above
+- Video MUST directly address the PRIMARY WEAKNESS (recurringWeaknesses[0].title)
+- Prioritize educational/instructional videos over game analysis
+- CONFIDENCE CHECK: Only include youtubeVideo if you are absolutely certain the video exists on YouTube`;
+
+// Board, side to move, castling and en passant fields of a FEN (drops the move counters)
+const toEpd = (fen) => fen.split(' ', 4).join(' ');
+
+const PAWNSPOSES_STRUCTURE_HEADER = '\n\n**ANALYSIS STRUCTURE:**\n\nReturn your analysis in the following JSON format:\n\n';
+const PAWNSPOSES_BEGIN = '\n\nBegin your analysis now.';
+
+// Everything in the single-user prompt that does not depend on the user; this is
+// what goes into the cachedContent
+const PAWNSPOSES_INSTRUCTIONS = `${PAWNSPOSES_PERSONA}${PAWNSPOSES_STRUCTURE_HEADER}${PAWNSPOSES_ANALYSIS_FORMAT}\n\n${PAWNSPOSES_REQUIREMENTS}`;
+
+/**
+ * Side that played the move leading to `fen` (the opposite of the side to move)
+ */
+const movedSide = (fen) => {
+  const space = fen ? fen.indexOf(' ') : -1;
+  return space >= 0 && fen.charAt(space + 1) === 'b' ? 'w' : 'b';
+};
+
+// Per-platform game metadata extractors
+const extractChessComGameInfo = (game) => ({
+  white: game.white?.username || 'Unknown',
+  black: game.black?.username || 'Unknown',
+  whiteRating: game.white?.rating || 0,
+  blackRating: game.black?.rating || 0,
+  result: game.white?.result === 'win' ? '1-0' : 
+          game.black?.result === 'win' ? '0-1' : 
+          game.white?.result === 'draw' ? '1/2-1/2' : 'Unknown',
+  eco: game.eco || 'Unknown',
+  timeControl: game.time_control || 'Unknown'
+});
+
+const extractLichessGameInfo = (game) => ({
+  white: game.players?.white?.user?.name || 'Unknown',
+  black: game.players?.black?.user?.name || 'Unknown',
+  whiteRating: game.players?.white?.rating || 0,
+  blackRating: game.players?.black?.rating || 0,
+  result: game.winner === 'white' ? '1-0' : 
+          game.winner === 'black' ? '0-1' : 
+          !game.winner ? '1/2-1/2' : 'Unknown',
+  eco: game.opening?.eco || 'Unknown',
+  timeControl: game.speed || 'Unknown'
+});
+
+const extractUnknownGameInfo = () => ({
+  white: 'Unknown',
+  black: 'Unknown',
+  whiteRating: 0,
+  blackRating: 0,
+  result: 'Unknown',
+  eco: 'Unknown',
+  timeControl: 'Unknown'
+});
+
+const GAME_INFO_EXTRACTORS = {
+  'chess.com': extractChessComGameInfo,
+  'lichess': extractLichessGameInfo
+};
+
+/**
+ * Append plies [from, to) of a game as PGN movetext ("1. e4 e5 2. Nf3").
+ * A Black move gets its "N..." number when it starts the text.
+ */
+const appendMoveText = (parts, plies, from, to, separated) => {
+  for (let i = from; i < to; i++) {
+    const pos = plies[i];
+    if (movedSide(pos.fen) === 'w') {
+      parts.push(separated ? ' ' : '', pos.moveNumber, '. ', pos.move);
+    } else if (i === from) {
+      parts.push(separated ? ' ' : '', pos.moveNumber, '... ', pos.move);
+    } else {
+      parts.push(' ', pos.move);
+    }
+    separated = true;
+  }
+};
+
+// Openings shared by several games are written once: only the first plies are
+// compared, and only lines at least this long are worth a dictionary entry
+const SHARED_OPENING_MIN_PLIES = 6;
+const SHARED_OPENING_MAX_PLIES = 24;
+
+// Played moves of each game (the starting position is dropped)
+const extractPlies = (games, fenData) => games.map((game, index) =>
+  (fenData[index]?.fenPositions || []).filter(pos => pos.moveNumber > 0)
+);
+
+/**
+ * Find opening lines that several games (from the standard start) have in common.
+ * Games are inserted into a move trie; each game then uses the deepest trie node
+ * on its path that another game also reached.
+ * @param {Array<Object>} fenData - fenData entry per game, aligned with plies
+ * @param {Array<Array>} plies - extractPlies output; may span several users' games
+ * @returns {{lines: Array<{id, moves, plies}>, byGame: Map<Array, {id, plies}>}} - byGame
+ *   is keyed by the game's plies array
+ */
+const findSharedOpenings = (fenData, plies) => {
+  const root = { count: 0, children: new Map() };
+  const paths = plies.map((moves, index) => {
+    const first = fenData[index]?.fenPositions?.[0];
+    if (first?.moveNumber === 0 && first.fen !== STANDARD_START_FEN) return null;
+
+    const path = [];
+    let node = root;
+    const depth = Math.min(moves.length, SHARED_OPENING_MAX_PLIES);
+    for (let i = 0; i < depth; i++) {
+      const { move } = moves[i];
+      if (!node.children.has(move)) node.children.set(move, { count: 0, children: new Map() });
+      node = node.children.get(move);
+      node.count++;
+      path.push(node);
+    }
+    return path;
+  });
+
+  // A line only pays for its dictionary entry when at least two games end up using it
+  const chosen = paths.map(path => {
+    if (!path) return null;
+    let length = path.length;
+    while (length > 0 && path[length - 1].count < 2) length--;
+    return length >= SHARED_OPENING_MIN_PLIES ? path[length - 1] : null;
+  });
+  const users = new Map();
+  chosen.forEach(node => {
+    if (node) users.set(node, (users.get(node) || 0) + 1);
+  });
+
+  const lines = [];
+  const idByNode = new Map();
+  const byGame = new Map();
+  chosen.forEach((node, gameIndex) => {
+    if (!node || users.get(node) < 2) return;
+    const length = paths[gameIndex].indexOf(node) + 1;
+    if (!idByNode.has(node)) {
+      idByNode.set(node, `O${lines.length + 1}`);
+      lines.push({ id: idByNode.get(node), moves: plies[gameIndex], plies: length });
+    }
+    byGame.set(plies[gameIndex], { id: idByNode.get(node), plies: length });
+  });
+
+  return { lines, byGame };
+};
+
+/**
+ * Write the shared opening lines of a prompt, once, ahead of every games section
+ */
+const appendSharedOpenings = (parts, openings) => {
+  if (openings.lines.length === 0) return;
+  parts.push('\nShared opening lines (a move list starting with [O1] continues from line O1):');
+  openings.lines.forEach(({ id, moves, plies: length }) => {
+    parts.push('\n', id, ': ');
+    appendMoveText(parts, moves, 0, length, false);
+  });
+  parts.push('\n');
+};
+
+/**
+ * Write one user's GAMES DATA section straight into a prompt buffer. Moves are
+ * rendered as a compact PGN list ("1. e4 e5 2. Nf3 Nc6 ..."); a game that starts
+ * with a shared opening line references it as [O1], [O2], ...
+ * @param {Array<string>} parts - Prompt buffer, joined once by the caller
+ * @param {Array<Array>} plies - extractPlies output for these games
+ * @param {Object} openings - findSharedOpenings output for the whole prompt
+ * @returns {Map<number, Array>} - fenIndex: gameNumber → fenPositions, used to join FENs back into examples
+ */
+const appendGamesSection = (parts, games, fenData, formData, plies, openings) => {
+  const fenIndex = new Map();
+  // The platform is fixed for the whole list, so pick its extractor once
+  const extractGameInfo = GAME_INFO_EXTRACTORS[formData.platform] || extractUnknownGameInfo;
+
+  games.forEach((game, index) => {
+    const gameNumber = index + 1;
+    const fenPositions = fenData[index]?.fenPositions || [];
+    fenIndex.set(gameNumber, fenPositions);
+
+    // Extract game metadata
+    const { white, black, whiteRating, blackRating, result, eco, timeControl } = extractGameInfo(game);
+
+    // Determine user's color
+    const isUserWhite = white === formData.username;
+
+    // One compact header line per game; the user's color and opponent come first
+    // because every example has to be read from the user's side. The previous game's
+    // moves end in '\n', so the header's leading '\n' is the only separator
+    parts.push(
+      '\n**GAME ', gameNumber, '** user=', isUserWhite ? 'white' : 'black',
+      ' vs. ', isUserWhite ? black : white,
+      '\nWhite: ', white, ' (', whiteRating, ') | Black: ', black, ' (', blackRating, ')',
+      ' | Result: ', result, ' | ECO: ', eco, ' | Time Control: ', timeControl,
+      '\n'
+    );
+
+    // Non-standard starts (Chess960, from-position games) as EPD: the move
+    // counters are implied by the move numbers below
+    const startingFen = fenPositions[0]?.moveNumber === 0 ? fenPositions[0].fen : STANDARD_START_FEN;
+    if (startingFen && startingFen !== STANDARD_START_FEN) {
+      parts.push('Start: ', toEpd(startingFen), '\n');
+    }
+
+    parts.push('Moves: ');
+    const shared = openings.byGame.get(plies[index]);
+    if (shared) parts.push('[', shared.id, ']');
+    appendMoveText(parts, plies[index], shared ? shared.plies : 0, plies[index].length, Boolean(shared));
+    parts.push('\n');
+  });
+
+  return fenIndex;
+};
+
+// Render the single-user prompt; use buildPromptStreaming, which memoizes it
+const renderPrompt = (games, fenData, formData) => {
+  console.log('🎯 Preparing games for Pawnsposes AI analysis...');
+
+  const parts = [
+    '**USER PROMPT**\nAnalyze the games of the user \'', formData.username,
+    '\'. The games are provided below as PGN move lists.\n\n**GAMES DATA:**\n'
+  ];
+  const plies = extractPlies(games, fenData);
+  const openings = findSharedOpenings(fenData, plies);
+  appendSharedOpenings(parts, openings);
+  const fenIndex = appendGamesSection(parts, games, fenData, formData, plies, openings);
+  const gamesPrompt = parts.join('');
+
+  // gamesPrompt alone is sent when the static instructions come from the context cache
+  const prompt = `${PAWNSPOSES_PERSONA}\n\n${gamesPrompt}${PAWNSPOSES_STRUCTURE_HEADER}${PAWNSPOSES_ANALYSIS_FORMAT}\n\n${PAWNSPOSES_REQUIREMENTS}${PAWNSPOSES_BEGIN}`;
+  return { prompt, gamesPrompt, fenIndex };
+};
+
+// Recently built prompts, most recently used last (Map keeps insertion order)
+const PROMPT_CACHE_SIZE = 16;
+const promptCache = new Map();
+
+/**
+ * Cheap synchronous fingerprint of a prompt's inputs: user, platform, and each
+ * game's url or id with its position count and final FEN. Re-renders and retries pass the same games,
+ * so this identifies them without hashing the ~50KB prompt itself.
+ */
+const promptFingerprint = (games, fenData, formData) => {
+  const parts = [formData.username, formData.platform];
+  games.forEach((game, index) => {
+    const fenPositions = fenData[index]?.fenPositions || [];
+    parts.push(`${gameIdentifier(game)}:${fenPositions.length}:${fenPositions[fenPositions.length - 1]?.fen || ''}`);
+  });
+  return parts.join('\n');
+};
+
+/**
+ * Build the Pawnsposes AI prompt for one user in a single pass.
+ * Results are memoized in a small LRU, so rebuilding the same games is free.
+ * @returns {{prompt: string, gamesPrompt: string, fenIndex: Map<number, Array>}} - gamesPrompt
+ *   is the user-specific part of prompt, for use with the cached instructions
+ */
+export const buildPromptStreaming = (games, fenData, formData) => {
+  const key = promptFingerprint(games, fenData, formData);
+  const cached = promptCache.get(key);
+  if (cached) {
+    promptCache.delete(key);
+    promptCache.set(key, cached);
+    return cached;
+  }
+
+  const built = renderPrompt(games, fenData, formData);
+  promptCache.set(key, built);
+  if (promptCache.size > PROMPT_CACHE_SIZE) {
+    promptCache.delete(promptCache.keys().next().value);
+  }
+  return built;
+};
+
+/**
+ * Create one prompt that analyzes several users' games in a single call.
+ * Each user is analyzed independently; the response is a JSON object keyed by username.
+ * @param {Array<Object>} usersArray - [{ games, fenData, formData }] with unique usernames
+ * @returns {{prompt: string, fenIndexes: Array<Map<number, Array>>}} - fenIndexes in user order
+ */
+export const createMultiUserPrompt = (usersArray) => {
+  const usernames = usersArray.map(({ formData }) => formData.username);
+  const parts = [
+    PAWNSPOSES_PERSONA,
+    '\n\n**USER PROMPT**\nAnalyze the games of each of the following ', usersArray.length, ' users: ',
+    usernames.map(u => `'${u}'`).join(', '),
+    '. Treat every user as a separate report — never mix games or examples between users, and "gameNumber" always refers to the game numbering within that user\'s own games. The games are provided below as PGN move lists.\n\n**GAMES DATA:**\n'
+  ];
+
+  // One opening dictionary for the whole prompt: users often play the same lines,
+  // so it is built over every user's games and written before the first user
+  const pliesByUser = usersArray.map(({ games, fenData }) => extractPlies(games, fenData));
+  const openings = findSharedOpenings(
+    usersArray.flatMap(({ games, fenData }) => games.map((game, index) => fenData[index])),
+    pliesByUser.flat()
+  );
+  appendSharedOpenings(parts, openings);
+
+  const fenIndexes = usersArray.map(({ games, fenData, formData }, index) => {
+    if (index > 0) parts.push('\n=====\n');
+    parts.push('\n**USER ', index + 1, ' (username=', formData.username, ')**\n');
+    return appendGamesSection(parts, games, fenData, formData, pliesByUser[index], openings);
+  });
+
+  parts.push(
+    '\n\n**ANALYSIS STRUCTURE:**\n\nReturn a single JSON object with exactly one key per username (',
+    usernames.map(u => `"${u}"`).join(', '),
+    '). The value for each username must follow this JSON format:\n\n',
+    PAWNSPOSES_ANALYSIS_FORMAT, '\n\n',
+    PAWNSPOSES_REQUIREMENTS, PAWNSPOSES_BEGIN
+  );
+
+  return { prompt: parts.join(''), fenIndexes };
+};
+
+// Response-parsing patterns, compiled once instead of on every call
+const SSE_LINE_SPLIT_RE = /\r?\n/;
+const BLACK_MOVE_RE = /^\s*\d+\s*(?:\.\.\.|…)/;
+const WHITE_MOVE_RE = /^\s*\d+\s*\./;
+const MOVE_PREFIX_RE = /^\s*\d+\s*(?:\.\.\.|…|\.)\s*/;
+const MOVE_ANNOTATION_RE = /[?!+#]+$/;
+
+const reportAnalysisSection = (onSection, path, value) => {
+  if (!onSection) return;
+  try {
+    onSection(path, value);
+  } catch (error) {
+    console.warn('⚠️ Pawnsposes AI section handler failed:', error);
+  }
+};
+
+/**
+ * Report an already complete analysis (cached, or shared with an in-flight call)
+ * to onSection in the same order the stream parser would: array elements first,
+ * then each top-level section.
+ */
+const replayAnalysisSections = (analysis, onSection) => {
+  if (!onSection) return;
+  Object.entries(analysis).forEach(([key, value]) => {
+    if (Array.isArray(value)) {
+      value.forEach((item, index) => reportAnalysisSection(onSection, `${key}.${index}`, item));
+    }
+    reportAnalysisSection(onSection, key, value);
+  });
+};
+
+/**
+ * Incremental parser for the analysis JSON while it streams in. feed() takes each
+ * new chunk of response text; every top-level section, and every element of an
+ * array section, is reported through onSection(path, value) as soon as it is
+ * complete ("executiveSummary", "recurringWeaknesses.0", ...). Each value is
+ * JSON.parsed once, on its own slice, and result() returns the assembled object
+ * once the root closes, so the full response never needs a second parse.
+ */
+const createAnalysisStreamParser = (onSection) => {
+  const analysis = {};
+  let text = '';
+  let pos = 0;
+  let depth = 0; // 0 until the root object opens
+  let inString = false;
+  let done = false;
+  let failed = false;
+
+  // Current root-level member, plus the elements parsed so far when its value is an array
+  let key = null;
+  let keyStart = -1;
+  let valueStart = -1;
+  let items = null;
+  let itemStart = -1;
+
+  const report = (path, value) => reportAnalysisSection(onSection, path, value);
+
+  const finishItem = (end) => {
+    const item = JSON.parse(text.slice(itemStart, end));
+    report(`${key}.${items.length}`, item);
+    items.push(item);
+    itemStart = -1;
+  };
+
+  const finishValue = (end) => {
+    const value = items || JSON.parse(text.slice(valueStart, end));
+    analysis[key] = value;
+    report(key, value);
+    key = null;
+    valueStart = -1;
+    items = null;
+  };
+
+  const scan = () => {
+    for (; pos < text.length && !done; pos++) {
+      const ch = text.charCodeAt(pos);
+
+      if (depth === 0) {
+        if (ch === 123) depth = 1; // {
+        continue;
+      }
+
+      if (inString) {
+        if (ch === 92) { // backslash: skip the escaped character
+          pos++;
+        } else if (ch === 34) { // "
+          inString = false;
+          if (depth === 1) {
+            if (valueStart < 0) key = JSON.parse(text.slice(keyStart, pos + 1));
+            else finishValue(pos + 1);
+          } else if (depth === 2 && itemStart >= 0) {
+            finishItem(pos + 1);
+          }
+        }
+        continue;
+      }
+
+      if (ch === 32 || ch === 9 || ch === 10 || ch === 13 || ch === 58) continue; // whitespace, :
+
+      if (ch === 44) { // , ends a pending number/true/false/null
+        if (depth === 1 && valueStart >= 0) finishValue(pos);
+        else if (depth === 2 && items && itemStart >= 0) finishItem(pos);
+        continue;
+      }
+
+      if (ch === 125 || ch === 93) { // } ]
+        if (depth === 1 && valueStart >= 0) finishValue(pos);
+        else if (depth === 2 && items && itemStart >= 0) finishItem(pos);
+        depth--;
+        if (depth === 2 && items && itemStart >= 0) finishItem(pos + 1);
+        else if (depth === 1 && valueStart >= 0) finishValue(pos + 1);
+        else if (depth === 0) done = true;
+        continue;
+      }
+
+      // Start of a key or value
+      if (depth === 1) {
+        if (key === null) {
+          keyStart = pos;
+        } else if (valueStart < 0) {
+          valueStart = pos;
+          if (ch === 91) items = []; // [
+        }
+      } else if (depth === 2 && items && itemStart < 0) {
+        itemStart = pos;
+      }
+      if (ch === 34) inString = true;
+      else if (ch === 123 || ch === 91) depth++;
+    }
+  };
+
+  return {
+    feed: (chunk) => {
+      if (failed || done) return;
+      text += chunk;
+      try {
+        scan();
+      } catch (error) {
+        // Leave malformed output to the full-text parser and its error reporting
+        failed = true;
+      }
+    },
+    result: () => (done && !failed ? analysis : null)
+  };
+};
+
+// Compiled once at module load; Ajv generates a validator function for the schema
+const ajv = new Ajv({ allErrors: true });
+const validateAnalysisSchema = ajv.compile(pawnsposesAnalysisSchema);
+
+/**
+ * Check a parsed analysis against src/schemas/pawnsposesAnalysis.schema.json
+ */
+const validatePawnsposesAnalysis = (jsonResult) => {
+  if (!validateAnalysisSchema(jsonResult)) {
+    throw new Error(`Invalid JSON structure from Pawnsposes AI: ${ajv.errorsText(validateAnalysisSchema.errors)}`);
+  }
+  return jsonResult;
+};
+
+/**
+ * Parse and validate the JSON analysis returned by Pawnsposes AI.
+ * Pass the stream parser's result as `streamed` to skip re-parsing the text.
+ */
+const parsePawnsposesAIResponse = (analysisText, streamed = null) => {
+  try {
+    const jsonResult = validatePawnsposesAnalysis(streamed || JSON.parse(analysisText));
+    
+    console.log('✅ Pawnsposes AI analysis parsed successfully');
+    console.log('📊 Found', jsonResult.recurringWeaknesses.length, 'recurring weaknesses');
+    
+    return jsonResult;
+    
+  } catch (parseError) {
+    console.error('❌ Failed to parse Pawnsposes AI JSON response:', parseError);
+    console.error('Raw response:', analysisText);
+    throw new Error('Failed to parse JSON response from Pawnsposes AI: ' + parseError.message);
+  }
+};
+
+/**
+ * Find the FEN after an example's move. The side comes from "15..." / "15."
+ * notation, otherwise from matching the SAN; White is assumed when neither works.
+ */
+const findExampleFen = (example, fenPositions) => {
+  const moveNumber = Number(example.moveNumber);
+  const moveText = String(example.move || '');
+  const side = BLACK_MOVE_RE.test(moveText) ? 'b' : WHITE_MOVE_RE.test(moveText) ? 'w' : null;
+  const san = side ? null : moveText.replace(MOVE_PREFIX_RE, '').replace(MOVE_ANNOTATION_RE, '').trim();
+
+  let fallback = null;
+  for (const pos of fenPositions) {
+    if (pos.moveNumber !== moveNumber) continue;
+    const moved = movedSide(pos.fen);
+    if (side ? moved === side : String(pos.move).replace(MOVE_ANNOTATION_RE, '') === san) return pos.fen;
+    if (!side && moved === 'w') fallback = pos.fen;
+  }
+  return fallback;
+};
+
+/**
+ * Fill in each example's FEN from the game it cites. The model only returns
+ * gameNumber/moveNumber/move, so positions are joined back in locally.
+ */
+const attachExampleFens = (analysis, fenIndex) => {
+  analysis.recurringWeaknesses.forEach(weakness => {
+    (weakness?.examples || []).forEach(example => {
+      const fenPositions = fenIndex.get(Number(example?.gameNumber));
+      if (!fenPositions) return;
+      const fen = findExampleFen(example, fenPositions);
+      if (fen) example.fen = fen;
+    });
+  });
+
+  return analysis;
+};
+
+/**
+ * Send a prompt to Gemini streamGenerateContent (SSE) and return the generated text.
+ * Text is accumulated as chunks arrive so callers can render partial output.
+ * @param {string} prompt - Prompt text
+ * @param {Object} options - { cachedContent, onChunk(chunkText), onPartialText(textSoFar) };
+ *   cachedContent is the name of a context cache the prompt continues from
+ */
+const streamPawnsposesContent = async (prompt, { cachedContent, onChunk, onPartialText } = {}) => {
+  const apiKey = getGeminiApiKey();
+
+  const response = await fetchWithBackoff(
+    `${GEMINI_API_BASE}/v1beta/models/${PAWNSPOSES_MODEL}:streamGenerateContent?alt=sse&key=${apiKey}`,
+    {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        ...(cachedContent && { cachedContent }),
+        contents: [{
+          parts: [{
+            text: prompt
+          }]
+        }],
+        generationConfig: PAWNSPOSES_GENERATION_CONFIG
+      })
+    }
+  );
+
+  if (!response.ok) {
+    const errorText = await response.text();
+    const error = new Error(`Gemini API error: ${response.status} - ${errorText}`);
+    error.status = response.status;
+    throw error;
+  }
+
+  let text = '';
+  let pending = '';
+
+  // Each SSE event is a single "data: {...}" line holding a partial generateContent response
+  const consumeLines = (final) => {
+    const lines = pending.split(SSE_LINE_SPLIT_RE);
+    pending = final ? '' : lines.pop();
+
+    lines.forEach(line => {
+      if (!line.startsWith('data:')) return;
+      const event = JSON.parse(line.slice(5));
+      if (event.error) {
+        throw new Error(`Gemini API error: ${event.error.code} - ${event.error.message}`);
+      }
+      const chunkText = event.candidates?.[0]?.content?.parts?.[0]?.text;
+      if (chunkText) {
+        text += chunkText;
+        if (onChunk) onChunk(chunkText);
+        if (onPartialText) onPartialText(text);
+      }
+    });
+  };
+
+  if (response.body?.getReader) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      pending += decoder.decode(value, { stream: true });
+      consumeLines(false);
+    }
+    pending += decoder.decode();
+  } else {
+    // Environments without streaming bodies still get the full SSE payload
+    pending = await response.text();
+  }
+  consumeLines(true);
+
+  if (!text) {
+    throw new Error('Invalid response structure from Gemini API');
+  }
+  return text;
+};
+
+// Pending or finished creation of the instructions cache: Promise<{ name, expiresAt }>
+let instructionsCache = null;
+let instructionsCacheUnavailable = !CONTEXT_CACHE_ENABLED;
+
+/**
+ * Store PAWNSPOSES_INSTRUCTIONS as a Gemini cachedContent
+ * @returns {Promise<{name: string, expiresAt: number}>}
+ */
+const createInstructionsCache = async () => {
+  const apiKey = getGeminiApiKey();
+
+  const response = await fetchWithBackoff(`${GEMINI_API_BASE}/v1beta/cachedContents?key=${apiKey}`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({
+      model: `models/${PAWNSPOSES_MODEL}`,
+      systemInstruction: { parts: [{ text: PAWNSPOSES_INSTRUCTIONS }] },
+      ttl: `${CONTEXT_CACHE_TTL_SEC}s`
+    })
+  });
+
+  if (!response.ok) {
+    const errorText = await response.text();
+    throw new Error(`Gemini context cache error: ${response.status} - ${errorText}`);
+  }
+
+  const cached = await response.json();
+  console.log('✅ Created Pawnsposes AI context cache:', cached.name);
+  return {
+    name: cached.name,
+    expiresAt: Date.parse(cached.expireTime) || Date.now() + CONTEXT_CACHE_TTL_SEC * 1000
+  };
+};
+
+/**
+ * Name of the cachedContent holding the static instructions, created on first use
+ * and re-created shortly before it expires. Null when context caching is off, or
+ * after creating the cache failed once (e.g. unsupported model or too few tokens).
+ */
+const getInstructionsCacheName = async () => {
+  if (instructionsCacheUnavailable) return null;
+
+  const pending = instructionsCache || (instructionsCache = createInstructionsCache());
+  try {
+    const { name, expiresAt } = await pending;
+    if (expiresAt - Date.now() > CONTEXT_CACHE_REFRESH_MARGIN_MS) return name;
+    if (instructionsCache === pending) instructionsCache = null;
+    return getInstructionsCacheName();
+  } catch (error) {
+    console.warn('⚠️ Pawnsposes AI context cache unavailable, sending full prompts:', error);
+    instructionsCacheUnavailable = true;
+    instructionsCache = null;
+    return null;
+  }
+};
+
+/**
+ * Stream the analysis, using the cached instructions when available. A cache the
+ * API rejects is re-created once; if that fails too, the full prompt is sent
+ * inline, so a cache problem never costs the report.
+ */
+const streamPawnsposesAnalysis = async ({ prompt, gamesPrompt }, options, retried = false) => {
+  const cachedContent = gamesPrompt ? await getInstructionsCacheName() : null;
+  if (!cachedContent) {
+    return streamPawnsposesContent(prompt, options);
+  }
+
+  try {
+    return await streamPawnsposesContent(gamesPrompt + PAWNSPOSES_BEGIN, { ...options, cachedContent });
+  } catch (error) {
+    // These are reported before any text streams, so retrying cannot duplicate output
+    if (!CONTEXT_CACHE_ERROR_STATUSES.includes(error.status)) throw error;
+    instructionsCache = null;
+    if (!retried) {
+      console.warn(`⚠️ Pawnsposes AI context cache rejected (${error.status}), refreshing it`);
+      return streamPawnsposesAnalysis({ prompt, gamesPrompt }, options, true);
+    }
+    console.warn('⚠️ Pawnsposes AI context cache rejected again, sending full prompts');
+    instructionsCacheUnavailable = true;
+    return streamPawnsposesContent(prompt, options);
+  }
+};
+
+/**
+ * Call Gemini API with Pawnsposes AI prompt.
+ * Used for single-report interactive flows.
+ * @param {Object} preparedPrompt - { prompt, gamesPrompt, fenIndex } from buildPromptStreaming
+ * @param {Object} options - { onPartialText(textSoFar), onSection(path, value) } to observe the
+ *   response while it streams; onSection gets each finished section, e.g. "executiveSummary"
+ *   or "recurringWeaknesses.0" (example FENs are attached only to the final result).
+ *   onPartialText is only a hook: the raw text is incomplete JSON, so no page renders it, and
+ *   the Reports loading screen uses onSection instead.
+ */
+export const callPawnsposesAI = async ({ prompt, gamesPrompt, fenIndex }, options = {}) => {
+  console.log('🤖 Calling Pawnsposes AI (Gemini)...');
+  
+  try {
+    const sectionParser = createAnalysisStreamParser(options.onSection);
+    const analysisText = await streamPawnsposesAnalysis({ prompt, gamesPrompt }, {
+      onChunk: sectionParser.feed,
+      onPartialText: options.onPartialText
+    });
+    console.log('📝 Raw Pawnsposes AI response:', analysisText.substring(0, 500) + '...');
+    
+    return attachExampleFens(parsePawnsposesAIResponse(analysisText, sectionParser.result()), fenIndex);
+    
+  } catch (error) {
+    console.error('❌ Error calling Pawnsposes AI:', error);
+    throw error;
+  }
+};
+
+// ========================================
+// 🧠 PAWNSPOSES AI RESULT CACHE
+// ========================================
+
+// In-flight analyses by cache key, so simultaneous requests share one API call
+const inFlightAnalyses = new Map();
+
+/**
+ * Content-addressed cache key: SHA-256 of prompt version + sorted game identifiers
+ * (each with a fenData fingerprint: ply count and final FEN) + user.
+ * Returns null when Web Crypto is unavailable (e.g. insecure origins), which disables caching.
+ */
+const computeAnalysisCacheKey = async (games, fenData, formData) => {
+  if (!globalThis.crypto?.subtle) return null;
+
+  const payload = JSON.stringify({
+    v: PAWNSPOSES_PROMPT_VERSION,
+    games: games.map((game, index) => {
+      const fenPositions = fenData[index]?.fenPositions || [];
+      return `${gameIdentifier(game)}:${fenPositions.length}:${fenPositions[fenPositions.length - 1]?.fen || ''}`;
+    }).sort(),
+    user: formData.username,
+    platform: formData.platform
+  });
+  const digest = await globalThis.crypto.subtle.digest('SHA-256', new TextEncoder().encode(payload));
+  return Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join('');
+};
+
+/**
+ * Open the IndexedDB cache; null outside the browser or if IndexedDB is unavailable
+ */
+const getAnalysisCache = async () => {
+  if (typeof indexedDB === 'undefined') return null;
+  try {
+    const db = getPuzzleDatabase();
+    if (!db.db) await db.initialize();
+    return db;
+  } catch (error) {
+    console.warn('⚠️ Pawnsposes AI cache unavailable:', error);
+    return null;
+  }
+};
+
+const readCachedAnalysis = async (key) => {
+  const cache = await getAnalysisCache();
+  if (!cache) return null;
+  try {
+    return await cache.getAIAnalysis(key);
+  } catch (error) {
+    console.warn('⚠️ Failed to read Pawnsposes AI cache:', error);
+    return null;
+  }
+};
+
+const writeCachedAnalysis = async (key, analysis) => {
+  const cache = await getAnalysisCache();
+  if (!cache) return;
+  try {
+    await cache.saveAIAnalysis(key, analysis, ANALYSIS_CACHE_TTL_MS);
+  } catch (error) {
+    console.warn('⚠️ Failed to write Pawnsposes AI cache:', error);
+  }
+};
+
+/**
+ * Prepare games and run the Gemini analysis (no caching)
+ */
+const runPawnsposesAIAnalysis = async (games, fenData, formData, options) => {
+  // Build the prompt and FEN side table in one pass
+  const preparedPrompt = buildPromptStreaming(games, fenData, formData);
+  console.log('✅ Prepared', games.length, 'games for analysis');
+  
+  // Call Pawnsposes AI
+  return callPawnsposesAI(preparedPrompt, options);
+};
+
+/**
+ * Main function to perform Pawnsposes AI analysis.
+ * Results are cached for 30 days per (prompt version, games, user); pass
+ * { bypassCache: true } to force a fresh analysis. options.onSection (see
+ * callPawnsposesAI) also fires for cached and shared results, once the analysis is
+ * available; onPartialText only fires for a fresh API call.
+ */
+export const performPawnsposesAIAnalysis = async (games, fenData, formData, options = {}) => {
+  console.log('🚀 Starting Pawnsposes AI Complete Analysis...');
+  
+  try {
+    const cacheKey = options.bypassCache ? null : await computeAnalysisCacheKey(games, fenData, formData);
+
+    if (!cacheKey) {
+      const analysis = await runPawnsposesAIAnalysis(games, fenData, formData, options);
+      console.log('✅ Pawnsposes AI analysis completed successfully');
+      return analysis;
+    }
+
+    if (inFlightAnalyses.has(cacheKey)) {
+      console.log('♻️ Joining in-flight Pawnsposes AI analysis');
+      const analysis = await inFlightAnalyses.get(cacheKey);
+      replayAnalysisSections(analysis, options.onSection);
+      return analysis;
+    }
+
+    // Registered before the first await, so a call arriving during the cache read joins it
+    const pending = (async () => {
+      const cached = await readCachedAnalysis(cacheKey);
+      if (cached) {
+        console.log('✅ Using cached Pawnsposes AI analysis');
+        replayAnalysisSections(cached, options.onSection);
+        return cached;
+      }
+
+      const analysis = await runPawnsposesAIAnalysis(games, fenData, formData, options);
+      await writeCachedAnalysis(cacheKey, analysis);
+      console.log('✅ Pawnsposes AI analysis completed successfully');
+      return analysis;
+    })();
+
+    inFlightAnalyses.set(cacheKey, pending);
+    try {
+      return await pending;
+    } finally {
+      inFlightAnalyses.delete(cacheKey);
+    }
+    
+  } catch (error) {
+    console.error('❌ Pawnsposes AI analysis failed:', error);
+    throw error;
+  }
+};
@@ -6,7 +6,7 @@
 class PuzzleDatabase {
   constructor() {
     this.dbName = 'PawnsPosesDB';
-    this.version = 2; // Increment version to add username index
+    this.version = 3; // v2: username index, v3: ai_analysis_cache store
     this.db = null;
   }
 
@@ -122,6 +122,14 @@ class PuzzleDatabase {
           console.log('⚙️ Created user_settings store');
         }
 
+        // AI Analysis Cache Store (content-addressed Gemini results)
+        if (!db.objectStoreNames.contains('ai_analysis_cache')) {
+          db.createObjectStore('ai_analysis_cache', { 
+            keyPath: 'key' 
+          });
+          console.log('🧠 Created ai_analysis_cache store');
+        }
+
         console.log('✅ Database schema setup complete');
       };
     });
@@ -452,6 +460,41 @@ class PuzzleDatabase {
     });
   }
 
+  // === AI ANALYSIS CACHE METHODS ===
+
+  async saveAIAnalysis(key, analysis, ttlMs) {
+    const transaction = this.db.transaction(['ai_analysis_cache'], 'readwrite');
+    const store = transaction.objectStore('ai_analysis_cache');
+    
+    return new Promise((resolve, reject) => {
+      const request = store.put({ key, analysis, expiresAt: Date.now() + ttlMs, createdAt: new Date().toISOString() });
+      request.onsuccess = () => resolve();
+      request.onerror = () => reject(request.error);
+    });
+  }
+
+  // Returns null for missing or expired entries (expired entries are removed)
+  async getAIAnalysis(key) {
+    const transaction = this.db.transaction(['ai_analysis_cache'], 'readwrite');
+    const store = transaction.objectStore('ai_analysis_cache');
+    
+    return new Promise((resolve, reject) => {
+      const request = store.get(key);
+      request.onsuccess = () => {
+        const result = request.result;
+        if (!result) {
+          resolve(null);
+        } else if (result.expiresAt <= Date.now()) {
+          store.delete(key);
+          resolve(null);
+        } else {
+          resolve(result.analysis);
+        }
+      };
+      request.onerror = () => reject(request.error);
+    });
+  }
+
   // === UTILITY METHODS ===
 
   async clearAllData() {
@@ -515,6 +558,8 @@ class PuzzleDatabase {
    * Clear all data from all stores
    */
   async clearAllData() {
+    // ai_analysis_cache is left alone: Reports clears everything on each page load,
+    // and cached analyses expire on their own TTL
     const storeNames = ['user_games', 'puzzles', 'user_mistakes', 'opening_deviations', 'user_progress', 'user_settings'];
     
     console.log('🗑️ Clearing all data from IndexedDB...');